@@ -1,8 +1,27 @@
 """Local RAG CLI package."""
 
-from local_rag_cli.cli import app
-from local_rag_cli.config import Settings, settings
-from local_rag_cli.ingest import ingest_directories
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from local_rag_cli.cli import app
+    from local_rag_cli.config import Settings, settings
+    from local_rag_cli.ingest import ingest_directories
 
 __version__ = "0.1.0"
 __all__ = ["Settings", "settings", "app", "ingest_directories"]
+
+# Resolved on first access so importing the package (e.g. for `--help` or
+# `version`) doesn't pull in torch, llama_index and the vector store clients
+_LAZY_ATTRS = {
+    "app": "local_rag_cli.cli",
+    "Settings": "local_rag_cli.config",
+    "settings": "local_rag_cli.config",
+    "ingest_directories": "local_rag_cli.ingest",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
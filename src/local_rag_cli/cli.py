@@ -9,10 +9,6 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
-from local_rag_cli.config import settings
-from local_rag_cli.ingest import ingest_directory
-from local_rag_cli.rag import chat_loop, print_sources, query_index
-
 app = typer.Typer(help="Local RAG CLI for Mac M4 Pro")
 console = Console()
 
@@ -20,56 +16,62 @@ console = Console()
 @app.command()
 def health():
     """Check health of vector store and LLM connections."""
+    from local_rag_cli.config import settings
+
     console.print("[bold blue]Checking connections...[/bold blue]\n")
 
-    # Check Vector Store
-    vector_store_ok = False
-    try:
-        if settings.VECTOR_STORE_TYPE == "chromadb":
-            import chromadb
-
-            client = chromadb.PersistentClient(path=settings.CHROMADB_PATH)
-            # ChromaDB doesn't have a direct health check, so we try to list collections
-            client.list_collections()
-            vector_store_ok = True
-            console.print("[green]✓ ChromaDB: OK[/green]")
-        elif settings.VECTOR_STORE_TYPE == "qdrant":
-            response = httpx.get(
-                f"{settings.QDRANT_URL}/collections",
-                timeout=10.0,
-                headers={"api-key": settings.QDRANT_API_KEY}
-                if settings.QDRANT_API_KEY
+    # One pooled client for both checks (shares connections when hosts match)
+    with httpx.Client(timeout=10.0) as http:
+        # Check Vector Store
+        vector_store_ok = False
+        try:
+            if settings.VECTOR_STORE_TYPE == "chromadb":
+                import chromadb
+
+                client = chromadb.PersistentClient(path=settings.CHROMADB_PATH)
+                # ChromaDB doesn't have a direct health check, so we try to list collections
+                client.list_collections()
+                vector_store_ok = True
+                console.print("[green]✓ ChromaDB: OK[/green]")
+            elif settings.VECTOR_STORE_TYPE == "qdrant":
+                response = http.get(
+                    f"{settings.QDRANT_URL}/collections",
+                    headers={"api-key": settings.QDRANT_API_KEY}
+                    if settings.QDRANT_API_KEY
+                    else {},
+                )
+                if response.status_code == 200:
+                    vector_store_ok = True
+                    console.print("[green]✓ Qdrant: OK[/green]")
+                else:
+                    console.print(f"[red]✗ Qdrant: HTTP {response.status_code}[/red]")
+            elif settings.VECTOR_STORE_TYPE == "memory":
+                # Nothing to connect to; the store is loaded from disk on demand
+                vector_store_ok = True
+                console.print("[green]✓ In-memory store: OK[/green]")
+            else:
+                console.print(
+                    f"[red]✗ Unknown vector store type: {settings.VECTOR_STORE_TYPE}[/red]"
+                )
+        except Exception as e:
+            console.print(f"[red]✗ Vector Store ({settings.VECTOR_STORE_TYPE}): {e}[/red]")
+
+        # Check LLM
+        llm_ok = False
+        try:
+            response = http.get(
+                f"{settings.LLM_BASE_URL}/models",
+                headers={"Authorization": f"Bearer {settings.LLM_API_KEY}"}
+                if settings.LLM_API_KEY
                 else {},
             )
             if response.status_code == 200:
-                vector_store_ok = True
-                console.print("[green]✓ Qdrant: OK[/green]")
+                llm_ok = True
+                console.print("[green]✓ LLM: OK[/green]")
             else:
-                console.print(f"[red]✗ Qdrant: HTTP {response.status_code}[/red]")
-        else:
-            console.print(
-                f"[red]✗ Unknown vector store type: {settings.VECTOR_STORE_TYPE}[/red]"
-            )
-    except Exception as e:
-        console.print(f"[red]✗ Vector Store ({settings.VECTOR_STORE_TYPE}): {e}[/red]")
-
-    # Check LLM
-    llm_ok = False
-    try:
-        response = httpx.get(
-            f"{settings.LLM_BASE_URL}/models",
-            timeout=10.0,
-            headers={"Authorization": f"Bearer {settings.LLM_API_KEY}"}
-            if settings.LLM_API_KEY
-            else {},
-        )
-        if response.status_code == 200:
-            llm_ok = True
-            console.print("[green]✓ LLM: OK[/green]")
-        else:
-            console.print(f"[red]✗ LLM: HTTP {response.status_code}[/red]")
-    except Exception as e:
-        console.print(f"[red]✗ LLM: {e}[/red]")
+                console.print(f"[red]✗ LLM: HTTP {response.status_code}[/red]")
+        except Exception as e:
+            console.print(f"[red]✗ LLM: {e}[/red]")
 
     console.print()
     if vector_store_ok and llm_ok:
@@ -108,6 +110,8 @@ def query(
     ),
 ):
     """Query the indexed documents."""
+    from local_rag_cli.rag import print_sources, query_index
+
     try:
         response = query_index(question)
         console.print("[bold green]Answer:[/bold green]")
@@ -122,6 +126,12 @@ def query(
 @app.command()
 def chat():
     """Start interactive chat session."""
+    from local_rag_cli.models import preload
+    from local_rag_cli.rag import chat_loop
+
+    # Load models once up front rather than on the first question
+    with console.status("Loading embedding models..."):
+        preload()
     chat_loop()
 
 
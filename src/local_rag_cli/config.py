@@ -1,39 +1,82 @@
 """Local RAG CLI configuration module."""
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Callable
 
+# Strings accepted for boolean settings (case-insensitive); anything else is an error
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "off"})
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables and .env file."""
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore",
-    )
+def _parse_bool(raw: str) -> bool:
+    value = raw.strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"not a boolean: {raw!r}")
+
+
+def _converter(field_type: Any) -> Callable[[str], Any]:
+    """Pick the parser for a field's declared type."""
+    if field_type is bool:
+        return _parse_bool
+    if field_type in (int, float):
+        return field_type
+    return str
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings loaded from environment variables and .env file.
+
+    ``Settings()`` holds the defaults; ``Settings.from_env()`` applies values
+    from the environment, and ``Settings.load()`` first fills the environment
+    from a ``.env`` file without overriding variables that are already set.
+
+    API keys are not fields: they are read from the environment on access,
+    so they never appear in the dataclass repr or ``asdict()`` output. A
+    ``.env`` file can still supply them via ``load()``.
+    """
 
     # Vector Store Configuration
-    VECTOR_STORE_TYPE: str = "chromadb"  # Options: "chromadb", "qdrant"
+    VECTOR_STORE_TYPE: str = "chromadb"  # Options: "chromadb", "qdrant", "memory"
 
     # ChromaDB Configuration (persistent mode)
     CHROMADB_PATH: str = "./chromadb_data"
 
+    # In-memory store Configuration (persisted as a NumPy matrix, searched by exact scan)
+    MEMORY_STORE_PATH: str = "./memory_store_data"
+
     # Docstore Configuration (for dedup and update detection)
     DOCSTORE_PATH: str = "./docstore_data"
 
+    # Embedding Cache Configuration (skips re-embedding unchanged chunks)
+    EMBED_CACHE_PATH: str = "./embed_cache_data"
+
     # Qdrant Configuration
     QDRANT_URL: str = "http://localhost:6333"
-    QDRANT_API_KEY: str | None = None
+    QDRANT_PREFER_GRPC: bool = True  # Use gRPC for data calls (faster bulk upserts)
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_ON_DISK: bool = False  # Keep vectors/HNSW in RAM; True trades ingest speed for memory
 
     # LLM Configuration (OpenAI-compatible)
     LLM_BASE_URL: str = "http://localhost:1234/v1"
-    LLM_API_KEY: str | None = None
     LLM_MODEL: str = "local-model"
 
     # Embedding Models
     TEXT_EMBEDDING_MODEL: str = "BAAI/bge-m3"
     IMAGE_EMBEDDING_MODEL: str = "ViT-B-32"
     IMAGE_EMBEDDING_PRETRAINED: str = "laion2b_s34b_b79k"
+    EMBED_BATCH_SIZE: int = 64  # Texts/images per embedding forward pass
+
+    # Compile the CLIP encoders with torch.compile (slower model load, faster encodes)
+    COMPILE_MODELS: bool = False
+
+    # Run the CLIP model in float16 on Apple Silicon (MPS) devices
+    CLIP_FP16: bool = True
 
     # Request Configuration
     REQUEST_TIMEOUT: float = 600.0  # 10 minutes for slow local inference
@@ -41,6 +84,55 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    @classmethod
+    def load(cls, env_file: str | None = None) -> "Settings":
+        """Build settings from the environment, after applying ``env_file`` if given."""
+        if env_file is not None:
+            # Only needed when a .env file is requested, not on import
+            from dotenv import load_dotenv
+
+            # Existing environment variables win over .env entries
+            load_dotenv(env_file, override=False)
+        return cls.from_env()
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from the process environment alone."""
+        env = os.environ
+        values = {}
+        for name, convert in _FIELDS:
+            raw = env.get(name)
+            if raw is None:
+                continue
+            try:
+                values[name] = convert(raw)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for {name}: {raw!r}") from e
+        return cls(**values)
+
+    @property
+    def QDRANT_API_KEY(self) -> str | None:
+        return os.environ.get("QDRANT_API_KEY")
+
+    @property
+    def LLM_API_KEY(self) -> str | None:
+        return os.environ.get("LLM_API_KEY")
+
+
+# (name, parser) per field, resolved once rather than per from_env() call
+_FIELDS = tuple((field.name, _converter(field.type)) for field in fields(Settings))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment and .env only once."""
+    return Settings.load(".env")
+
 
-# Global settings instance
-settings = Settings()
+def __getattr__(name: str) -> Settings:
+    """Create the global settings instance on first access rather than at import."""
+    if name == "settings":
+        settings = get_settings()
+        globals()["settings"] = settings
+        return settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
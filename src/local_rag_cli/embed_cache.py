@@ -0,0 +1,137 @@
+"""Persistent on-disk cache of chunk embeddings."""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.schema import BaseNode, MetadataMode, TransformComponent
+
+# Cache database file inside EMBED_CACHE_PATH
+CACHE_FILE_NAME = "embeddings.db"
+
+# Stay below SQLite's bound-parameter limit on older builds
+MAX_QUERY_PARAMS = 900
+
+
+def content_hash(text: str) -> str:
+    """Hash the exact text sent to the embedding model."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite store of embeddings keyed by (content hash, model, pretrained).
+
+    Vectors are stored as float16 blobs, halving disk usage at a precision
+    loss well below what affects cosine ranking.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        # WAL with relaxed syncing: a lost write only costs a re-embed
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "hash TEXT, model TEXT, pretrained TEXT, dim INT, vec BLOB, "
+            "PRIMARY KEY (hash, model, pretrained))"
+        )
+
+    def __enter__(self) -> "EmbeddingCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get_many(
+        self, hashes: Sequence[str], model: str, pretrained: str = ""
+    ) -> Dict[str, List[float]]:
+        """Return cached embeddings for whichever hashes are present."""
+        unique_hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+
+        for start in range(0, len(unique_hashes), MAX_QUERY_PARAMS):
+            batch = unique_hashes[start : start + MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                "SELECT hash, vec FROM embedding_cache "
+                f"WHERE model = ? AND pretrained = ? AND hash IN ({placeholders})",
+                (model, pretrained, *batch),
+            )
+            rows = rows.fetchall()
+            if not rows:
+                continue
+
+            # One model and pretrained tag means one dimension, so the batch
+            # decodes as a single (N, D) array instead of one array per row
+            batch_hashes, blobs = zip(*rows)
+            vecs = np.frombuffer(b"".join(blobs), dtype=np.float16)
+            vecs = vecs.reshape(len(blobs), -1).astype(np.float32).tolist()
+            found.update(zip(batch_hashes, vecs))
+
+        return found
+
+    def put_many(
+        self,
+        entries: Iterable[Tuple[str, Sequence[float]]],
+        model: str,
+        pretrained: str = "",
+    ) -> None:
+        """Store embeddings in a single transaction."""
+        rows = []
+        for hash_, embedding in entries:
+            vec = np.asarray(embedding, dtype=np.float16)
+            rows.append((hash_, model, pretrained, len(vec), vec.tobytes()))
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+
+class CachedEmbedding(TransformComponent):
+    """Ingestion transform that reuses cached embeddings before calling the model.
+
+    Only nodes whose embedding text has not been seen with the same model are
+    passed on to ``embed_model``; their fresh embeddings are then cached.
+    """
+
+    embed_model: BaseEmbedding
+    cache_path: str
+
+    def __call__(self, nodes: Sequence[BaseNode], **kwargs: Any) -> Sequence[BaseNode]:
+        model_name = self.embed_model.model_name
+        pretrained = getattr(self.embed_model, "pretrained", "")
+        hashes = [
+            content_hash(node.get_content(metadata_mode=MetadataMode.EMBED))
+            for node in nodes
+        ]
+
+        # Open per call so the transform is safe to run from any thread
+        with EmbeddingCache(Path(self.cache_path) / CACHE_FILE_NAME) as cache:
+            cached = cache.get_many(hashes, model_name, pretrained)
+
+            misses: List[Tuple[BaseNode, str]] = []
+            for node, hash_ in zip(nodes, hashes):
+                if hash_ in cached:
+                    node.embedding = cached[hash_]
+                else:
+                    misses.append((node, hash_))
+
+            if misses:
+                self.embed_model([node for node, _ in misses], **kwargs)
+                cache.put_many(
+                    [(hash_, node.get_embedding()) for node, hash_ in misses],
+                    model_name,
+                    pretrained,
+                )
+
+        return nodes
@@ -0,0 +1,281 @@
+"""Exact similarity search over an in-RAM embedding matrix."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import fsspec
+import numpy as np
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    MetadataFilters,
+    VectorStoreQuery,
+    VectorStoreQueryMode,
+    VectorStoreQueryResult,
+)
+from llama_index.core.vector_stores.utils import (
+    build_metadata_filter_fn,
+    metadata_dict_to_node,
+    node_to_metadata_dict,
+)
+
+# Files inside a persisted ScanVectorStore directory
+EMBEDDINGS_FILE_NAME = "embeddings.npy"
+NODES_FILE_NAME = "nodes.json"
+
+
+class EmbedScan:
+    """Row-aligned node ids and a dense (N, D) matrix of unit-length embeddings.
+
+    At personal-corpus scale one matrix-vector product is faster than an ANN
+    index and needs no build step. Rows are L2-normalized on insert so cosine
+    similarity is a plain dot product, and kept as float32 because NumPy has
+    no BLAS path for float16 matmuls.
+    """
+
+    def __init__(
+        self, ids: Sequence[str] = (), mat: Optional[np.ndarray] = None
+    ) -> None:
+        """Wrap ``mat`` (already normalized, one row per id) without copying it."""
+        self.ids: List[str] = list(ids)
+        self.mat = mat if mat is not None else np.empty((0, 0), dtype=np.float32)
+        self._rows: Dict[str, int] = {node_id: i for i, node_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._rows
+
+    def row(self, node_id: str) -> int:
+        return self._rows[node_id]
+
+    def add(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Append rows for new ids and overwrite the rows of existing ones."""
+        if not ids:
+            return
+        rows = _normalize(np.asarray(embeddings, dtype=np.float32))
+
+        new_ids: List[str] = []
+        new_rows: List[int] = []
+        for i, node_id in enumerate(ids):
+            index = self._rows.get(node_id)
+            if index is None:
+                self._rows[node_id] = len(self.ids) + len(new_ids)
+                new_ids.append(node_id)
+                new_rows.append(i)
+            elif index >= len(self.ids):
+                # Repeated within this batch; the last occurrence wins
+                new_rows[index - len(self.ids)] = i
+            else:
+                self.mat[index] = rows[i]
+
+        if new_ids:
+            appended = rows[new_rows]
+            self.mat = np.vstack([self.mat, appended]) if self.ids else appended
+            self.ids.extend(new_ids)
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """Drop the rows of any of ``ids`` that are present."""
+        drop = [self._rows[node_id] for node_id in ids if node_id in self._rows]
+        if not drop:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[drop] = False
+        self.mat = self.mat[keep]
+        self.ids = [node_id for node_id, kept in zip(self.ids, keep) if kept]
+        self._rows = {node_id: i for i, node_id in enumerate(self.ids)}
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[List[float], List[str]]:
+        """Return the top-k cosine similarities and ids, best first.
+
+        ``rows`` restricts the search to those row indices.
+        """
+        if rows is None:
+            mat, rows = self.mat, np.arange(len(self.ids))
+        else:
+            mat = self.mat[rows]
+        if not len(rows) or k <= 0:
+            return [], []
+
+        scores = mat @ _normalize(np.asarray(query, dtype=np.float32))
+
+        # Partial selection only pays off when it discards rows
+        if k < len(rows):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+        return scores[top].tolist(), [self.ids[rows[i]] for i in top]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale vectors (or rows of a matrix) to unit L2 norm."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _write_atomically(path: Path, write: Callable[[Any], None]) -> None:
+    """Write a file via a temporary sibling so readers (and mmaps) never see it half-written."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class ScanVectorStore(BasePydanticVectorStore):
+    """Vector store held in RAM as an EmbedScan plus per-node metadata.
+
+    Persisted as a directory holding the embedding matrix as a ``.npy`` file,
+    memory-mapped on load, and node ids, ref doc ids and metadata (including
+    node text) as JSON. Supports default (similarity) queries only.
+    """
+
+    stores_text: bool = True
+
+    _scan: EmbedScan = PrivateAttr(default_factory=EmbedScan)
+    _ref_doc_ids: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _metadata: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ScanVectorStore"
+
+    @property
+    def client(self) -> None:
+        return None
+
+    def add(self, nodes: Sequence[BaseNode], **add_kwargs: Any) -> List[str]:
+        """Add nodes, keeping their serialized content for retrieval."""
+        ids = [node.node_id for node in nodes]
+        self._scan.add(ids, [node.get_embedding() for node in nodes])
+        for node in nodes:
+            self._ref_doc_ids[node.node_id] = node.ref_doc_id or "None"
+            self._metadata[node.node_id] = node_to_metadata_dict(
+                node, remove_text=False, flat_metadata=False
+            )
+        return ids
+
+    def _remove(self, ids: Sequence[str]) -> None:
+        self._scan.remove(ids)
+        for node_id in ids:
+            self._ref_doc_ids.pop(node_id, None)
+            self._metadata.pop(node_id, None)
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        """Delete all nodes of a source document."""
+        self._remove(
+            [
+                node_id
+                for node_id, node_ref_doc_id in self._ref_doc_ids.items()
+                if node_ref_doc_id == ref_doc_id
+            ]
+        )
+
+    def delete_nodes(
+        self,
+        node_ids: Optional[List[str]] = None,
+        filters: Optional[MetadataFilters] = None,
+        **delete_kwargs: Any,
+    ) -> None:
+        """Delete nodes matching both ``node_ids`` and ``filters`` (if given)."""
+        self._remove(self._matching_ids(node_ids, filters))
+
+    def clear(self) -> None:
+        self._scan = EmbedScan()
+        self._ref_doc_ids = {}
+        self._metadata = {}
+
+    def _matching_ids(
+        self,
+        node_ids: Optional[Sequence[str]],
+        filters: Optional[MetadataFilters],
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Ids of stored nodes matching every given restriction."""
+        filter_fn = build_metadata_filter_fn(lambda node_id: self._metadata[node_id], filters)
+        candidates = self._scan.ids if node_ids is None else node_ids
+        ref_doc_ids = None if doc_ids is None else set(doc_ids)
+        return [
+            node_id
+            for node_id in candidates
+            if node_id in self._scan
+            and (ref_doc_ids is None or self._ref_doc_ids[node_id] in ref_doc_ids)
+            and filter_fn(node_id)
+        ]
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """Return the nodes most similar to the query embedding."""
+        if query.mode != VectorStoreQueryMode.DEFAULT:
+            raise ValueError(f"Invalid query mode: {query.mode}")
+        if query.query_embedding is None:
+            raise ValueError("Query embedding is required")
+
+        rows = None
+        if (
+            query.filters is not None
+            or query.node_ids is not None
+            or query.doc_ids is not None
+        ):
+            matching = self._matching_ids(query.node_ids, query.filters, query.doc_ids)
+            rows = np.array([self._scan.row(node_id) for node_id in matching], dtype=int)
+
+        similarities, ids = self._scan.search(
+            query.query_embedding, query.similarity_top_k, rows
+        )
+        nodes = [metadata_dict_to_node(self._metadata[node_id]) for node_id in ids]
+        return VectorStoreQueryResult(nodes=nodes, similarities=similarities, ids=ids)
+
+    def persist(
+        self, persist_path: str, fs: Optional[fsspec.AbstractFileSystem] = None
+    ) -> None:
+        """Write the store to the ``persist_path`` directory."""
+        persist_dir = Path(persist_path)
+        persist_dir.mkdir(parents=True, exist_ok=True)
+
+        # Matrix first: nodes.json is what marks a complete store on load
+        _write_atomically(
+            persist_dir / EMBEDDINGS_FILE_NAME,
+            lambda f: np.save(f, np.ascontiguousarray(self._scan.mat)),
+        )
+        nodes = {
+            "ids": self._scan.ids,
+            "ref_doc_ids": [self._ref_doc_ids[node_id] for node_id in self._scan.ids],
+            "metadata": [self._metadata[node_id] for node_id in self._scan.ids],
+        }
+        _write_atomically(
+            persist_dir / NODES_FILE_NAME, lambda f: f.write(json.dumps(nodes).encode())
+        )
+
+    @classmethod
+    def exists(cls, persist_dir: str | Path) -> bool:
+        return (Path(persist_dir) / NODES_FILE_NAME).exists()
+
+    @classmethod
+    def from_persist_dir(cls, persist_dir: str | Path) -> "ScanVectorStore":
+        """Load a store written by ``persist``."""
+        persist_dir = Path(persist_dir)
+        with open(persist_dir / NODES_FILE_NAME, "rb") as f:
+            nodes = json.load(f)
+        ids = nodes["ids"]
+
+        store = cls()
+        if ids:
+            # Copy-on-write mapping: pages load lazily and updates stay private
+            mat = np.load(persist_dir / EMBEDDINGS_FILE_NAME, mmap_mode="c")
+            if mat.shape[0] != len(ids):
+                raise ValueError(
+                    f"{persist_dir} has {mat.shape[0]} embeddings for {len(ids)} nodes"
+                )
+            store._scan = EmbedScan(ids, mat)
+        store._ref_doc_ids = dict(zip(ids, nodes["ref_doc_ids"]))
+        store._metadata = dict(zip(ids, nodes["metadata"]))
+        return store
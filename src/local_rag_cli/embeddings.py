@@ -1,12 +1,115 @@
 """Custom OpenCLIP embedding model for image and text embeddings."""
 
-from typing import Any, List
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
 
-import open_clip
+import numpy as np
 import torch
+from llama_index.core.base.embeddings.base import BaseEmbedding
 from llama_index.core.bridge.pydantic import Field, PrivateAttr
 from llama_index.core.embeddings.multi_modal_base import MultiModalEmbedding
+from llama_index.core.schema import BaseNode, ImageDocument, ImageNode, ImageType
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from PIL import Image
+from torchvision.transforms import v2
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache of query embeddings shared by all model instances."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return embedding
+
+    def put(self, key: Hashable, embedding: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the current hit rate."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+query_embedding_cache = QueryEmbeddingCache(maxsize=1024)
+
+# Held around every forward pass so the text and image models, which ingest
+# runs from separate threads, never submit work to the accelerator at once
+# (concurrent use of the MPS backend is unsafe). Decoding, cache lookups and
+# vector-store writes stay outside it.
+accelerator_lock = threading.RLock()
+
+
+def _cached_query_embedding(
+    model: BaseEmbedding, query: str, embed: Callable[[str], List[float]]
+) -> List[float]:
+    """Look up a query embedding by model identity, embedding it on a miss.
+
+    Keyed by model name rather than instance so results survive the model
+    being re-created between queries.
+    """
+    key = (model.class_name(), model.model_name, getattr(model, "pretrained", ""), query)
+    embedding = query_embedding_cache.get(key)
+    if embedding is None:
+        embedding = embed(query)
+        query_embedding_cache.put(key, embedding)
+    return embedding
+
+
+class CachedHuggingFaceEmbedding(HuggingFaceEmbedding):
+    """HuggingFace text embedding that reuses recent query embeddings.
+
+    Forward passes hold ``accelerator_lock``.
+    """
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return _cached_query_embedding(self, query, self._embed_query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _embed_query(self, query: str) -> List[float]:
+        with accelerator_lock:
+            return super()._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        with accelerator_lock:
+            return super()._get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        with accelerator_lock:
+            return super()._get_text_embeddings(texts)
 
 
 class OpenCLIPEmbedding(MultiModalEmbedding):
@@ -18,38 +121,115 @@ class OpenCLIPEmbedding(MultiModalEmbedding):
 
     model_name: str = Field(default="ViT-B-32", description="OpenCLIP model name")
     pretrained: str = Field(default="laion2b_s34b_b79k", description="Pretrained weights")
+    embed_batch_size: int = Field(
+        default=32,
+        description="Number of texts or images encoded per forward pass",
+        gt=0,
+        le=2048,
+    )
+    compile_model: bool = Field(
+        default=False, description="Compile the encoders with torch.compile"
+    )
+    fp16: bool = Field(
+        default=False, description="Run the model in float16 when on MPS"
+    )
 
     _model: Any = PrivateAttr()
     _preprocess: Any = PrivateAttr()
+    _image_transform: Optional[v2.Compose] = PrivateAttr()
+    _transform_device: str = PrivateAttr()
+    _decode_size: int = PrivateAttr()
     _tokenizer: Any = PrivateAttr()
     _device: str = PrivateAttr()
+    _dtype: Any = PrivateAttr()
+    _encode_text: Any = PrivateAttr()
+    _encode_image: Any = PrivateAttr()
 
     def __init__(
         self,
         model_name: str = "ViT-B-32",
         pretrained: str = "laion2b_s34b_b79k",
+        compile_model: bool = False,
+        fp16: bool = False,
         **kwargs: Any,
     ) -> None:
-        super().__init__(model_name=model_name, pretrained=pretrained, **kwargs)
+        import open_clip
+
+        super().__init__(
+            model_name=model_name,
+            pretrained=pretrained,
+            compile_model=compile_model,
+            fp16=fp16,
+            **kwargs,
+        )
 
         self._device = "mps" if torch.backends.mps.is_available() else "cpu"
         self._model, _, self._preprocess = open_clip.create_model_and_transforms(
             model_name, pretrained=pretrained, device=self._device
         )
         self._tokenizer = open_clip.get_tokenizer(model_name)
+        self._init_image_transform(open_clip.get_model_preprocess_cfg(self._model))
         self._model.eval()
+        # NHWC keeps pixels of a patch adjacent for the patch-embedding conv
+        self._model = self._model.to(memory_format=torch.channels_last)
+
+        # Half precision halves memory traffic on MPS; CPU fp16 kernels are slow
+        self._dtype = torch.float32
+        if fp16 and self._device == "mps":
+            self._model = self._model.half()
+            self._dtype = torch.float16
+
+        self._encode_text = self._model.encode_text
+        self._encode_image = self._model.encode_image
+        if compile_model:
+            self._compile_encoders()
+
+    def _compile_encoders(self) -> None:
+        """Compile both encoders and warm them up, keeping eager mode on failure.
+
+        Compilation is lazy, so the warm-up pass is what pays the compile cost
+        (and surfaces unsupported models) here rather than on the first query.
+        """
+        try:
+            encode_text = torch.compile(
+                self._model.encode_text, mode="reduce-overhead", dynamic=True
+            )
+            encode_image = torch.compile(
+                self._model.encode_image, mode="reduce-overhead", dynamic=True
+            )
+            dummy_image = self._preprocess(Image.new("RGB", (224, 224))).unsqueeze(0)
+            dummy_tokens = self._tokenizer([""])
+            with torch.inference_mode():
+                encode_text(dummy_tokens.to(self._device))
+                encode_image(
+                    dummy_image.to(
+                        self._device,
+                        dtype=self._dtype,
+                        memory_format=torch.channels_last,
+                    )
+                )
+        except Exception:
+            return
+
+        self._encode_text = encode_text
+        self._encode_image = encode_image
 
     @classmethod
     def class_name(cls) -> str:
         return "OpenCLIPEmbedding"
 
+    def _get_text_embeddings_np(self, texts: List[str]) -> np.ndarray:
+        """Embed a list of text strings into an (N, D) float32 array."""
+        tokens = self._tokenizer(texts)
+        with accelerator_lock, torch.inference_mode():
+            # Normalize in float32 regardless of the model's precision
+            text_features = self._encode_text(tokens.to(self._device)).float()
+            text_features /= text_features.norm(dim=-1, keepdim=True)
+            return text_features.cpu().numpy()
+
     def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Embed a list of text strings."""
-        tokens = self._tokenizer(texts).to(self._device)
-        with torch.no_grad():
-            text_features = self._model.encode_text(tokens)
-            text_features /= text_features.norm(dim=-1, keepdim=True)
-        return text_features.cpu().tolist()
+        return self._get_text_embeddings_np(texts).tolist()
 
     def _get_text_embedding(self, text: str) -> List[float]:
         """Embed a single text string."""
@@ -61,21 +241,175 @@ class OpenCLIPEmbedding(MultiModalEmbedding):
     async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
         return self._get_text_embeddings(texts)
 
-    def _get_image_embedding(self, image_path: str) -> List[float]:
-        """Embed a single image from a file path."""
-        image = Image.open(image_path).convert("RGB")
-        image_input = self._preprocess(image).unsqueeze(0).to(self._device)
-        with torch.no_grad():
-            image_features = self._model.encode_image(image_input)
+    def _init_image_transform(self, cfg: Dict[str, Any]) -> None:
+        """Mirror open_clip's eval preprocessing as tensor ops that run on-device.
+
+        Resize modes without a plain torchvision equivalent keep open_clip's
+        PIL pipeline, and devices missing a resize kernel transform on the CPU.
+        """
+        self._image_transform = _build_image_transform(cfg)
+        self._transform_device = self._device
+        size = cfg["size"]
+        self._decode_size = max(size) if isinstance(size, (tuple, list)) else size
+        if self._image_transform is None:
+            return
+        try:
+            probe = torch.zeros(3, 32, 32, dtype=torch.uint8, device=self._device)
+            self._image_transform(probe)
+        except (NotImplementedError, RuntimeError):
+            self._transform_device = "cpu"
+
+    def _load_image(self, image: ImageType) -> torch.Tensor:
+        """Open and preprocess a single image with open_clip's PIL pipeline."""
+        return self._preprocess(Image.open(image).convert("RGB"))
+
+    def _decode_image(self, image: ImageType) -> torch.Tensor:
+        """Decode an image into a uint8 CHW tensor no larger than needed.
+
+        JPEGs decode at a reduced DCT scale and other formats are box-reduced
+        by an integer factor, so a batch holds a few hundred pixels per side
+        rather than full camera frames. The shortest side stays at least the
+        model's input size, leaving the final antialiased resize to the transform.
+        """
+        img = Image.open(image)
+        img.draft("RGB", (self._decode_size, self._decode_size))
+        img = img.convert("RGB")
+        factor = min(img.size) // self._decode_size
+        if factor > 1:
+            img = img.reduce(factor)
+        return torch.from_numpy(np.array(img)).permute(2, 0, 1)
+
+    def _read_images(self, images: List[ImageType]) -> List[torch.Tensor]:
+        """Decode images in parallel, preprocessing them too on the PIL path."""
+        loader = self._load_image if self._image_transform is None else self._decode_image
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            return list(pool.map(loader, images))
+
+    def _batch_images(self, loaded: List[torch.Tensor]) -> torch.Tensor:
+        """Stack images from _read_images into one preprocessed batch."""
+        if self._image_transform is None:
+            return torch.stack(loaded)
+
+        # Resize/crop/normalize on the device; only raw uint8 pixels are copied
+        return torch.stack(
+            [
+                self._image_transform(image.to(self._transform_device, non_blocking=True))
+                for image in loaded
+            ]
+        )
+
+    def _get_image_embeddings_np(self, img_file_paths: List[ImageType]) -> np.ndarray:
+        """Embed a batch of images into an (N, D) float32 array in one forward pass.
+
+        Decoding runs in a thread pool (PIL releases the GIL) outside
+        ``accelerator_lock``, so file I/O overlaps with other models' encodes.
+        """
+        loaded = self._read_images(img_file_paths)
+        with accelerator_lock, torch.inference_mode():
+            image_input = self._batch_images(loaded).to(
+                self._device, dtype=self._dtype, memory_format=torch.channels_last
+            )
+            image_features = self._encode_image(image_input).float()
             image_features /= image_features.norm(dim=-1, keepdim=True)
-        return image_features.squeeze().cpu().tolist()
+            return image_features.cpu().numpy()
 
-    async def _aget_image_embedding(self, img_file_path: str) -> List[float]:
+    def _get_image_embeddings(self, img_file_paths: List[ImageType]) -> List[List[float]]:
+        """Embed a batch of images."""
+        return self._get_image_embeddings_np(img_file_paths).tolist()
+
+    async def _aget_image_embeddings(
+        self, img_file_paths: List[ImageType]
+    ) -> List[List[float]]:
+        return self._get_image_embeddings(img_file_paths)
+
+    def _get_image_embedding(self, img_file_path: ImageType) -> List[float]:
+        """Embed a single image from a file path or buffer."""
+        return self._get_image_embeddings([img_file_path])[0]
+
+    async def _aget_image_embedding(self, img_file_path: ImageType) -> List[float]:
         return self._get_image_embedding(img_file_path)
 
     def _get_query_embedding(self, query: str) -> List[float]:
         """Embed a query string (same as text embedding)."""
-        return self._get_text_embedding(query)
+        return _cached_query_embedding(self, query, self._get_text_embedding)
 
     async def _aget_query_embedding(self, query: str) -> List[float]:
         return self._get_query_embedding(query)
+
+    def __call__(self, nodes: Sequence[BaseNode], **kwargs: Any) -> Sequence[BaseNode]:
+        """Embed image nodes from their pixels and any other nodes as text.
+
+        The base transform only embeds node text, which for image documents
+        is metadata rather than the image itself.
+        """
+        image_nodes = [node for node in nodes if _is_image_node(node)]
+        text_nodes = [node for node in nodes if not _is_image_node(node)]
+
+        if image_nodes:
+            embeddings = self.get_image_embedding_batch(
+                [_image_source(node) for node in image_nodes], **kwargs
+            )
+            for node, embedding in zip(image_nodes, embeddings):
+                node.embedding = embedding
+        if text_nodes:
+            super().__call__(text_nodes, **kwargs)
+        return nodes
+
+    async def acall(
+        self, nodes: Sequence[BaseNode], **kwargs: Any
+    ) -> Sequence[BaseNode]:
+        image_nodes = [node for node in nodes if _is_image_node(node)]
+        text_nodes = [node for node in nodes if not _is_image_node(node)]
+
+        if image_nodes:
+            embeddings = await self.aget_image_embedding_batch(
+                [_image_source(node) for node in image_nodes], **kwargs
+            )
+            for node, embedding in zip(image_nodes, embeddings):
+                node.embedding = embedding
+        if text_nodes:
+            await super().acall(text_nodes, **kwargs)
+        return nodes
+
+
+def _is_image_node(node: BaseNode) -> bool:
+    return isinstance(node, (ImageNode, ImageDocument))
+
+
+def _image_source(node: BaseNode) -> ImageType:
+    """Prefer the on-disk path so decoding happens in the loader threads."""
+    image_path = getattr(node, "image_path", None)
+    return image_path if image_path else node.resolve_image()  # type: ignore[attr-defined]
+
+
+def _build_image_transform(cfg: Dict[str, Any]) -> Optional[v2.Compose]:
+    """Build a tensor transform matching open_clip's eval preprocessing."""
+    size = cfg["size"]
+    if isinstance(size, (tuple, list)):
+        if size[0] != size[1]:
+            return None
+        size = size[0]
+
+    interpolation = (
+        v2.InterpolationMode.BILINEAR
+        if cfg.get("interpolation") == "bilinear"
+        else v2.InterpolationMode.BICUBIC
+    )
+    resize_mode = cfg.get("resize_mode", "shortest")
+    if resize_mode == "shortest":
+        resize = [
+            v2.Resize(size, interpolation=interpolation, antialias=True),
+            v2.CenterCrop(size),
+        ]
+    elif resize_mode == "squash":
+        resize = [v2.Resize((size, size), interpolation=interpolation, antialias=True)]
+    else:
+        return None
+
+    return v2.Compose(
+        [
+            v2.ToDtype(torch.float32, scale=True),
+            *resize,
+            v2.Normalize(mean=list(cfg["mean"]), std=list(cfg["std"])),
+        ]
+    )
@@ -1,152 +1,149 @@
 """Ingestion pipeline for documents and images."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
-from llama_index.core import SimpleDirectoryReader
+from llama_index.core import Document, SimpleDirectoryReader
 from llama_index.core.ingestion import DocstoreStrategy, IngestionPipeline
 from llama_index.core.node_parser import SentenceSplitter
 from llama_index.core.storage.docstore import SimpleDocumentStore
-from local_rag_cli.embeddings import OpenCLIPEmbedding
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from llama_index.core.storage.kvstore import SimpleKVStore
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from local_rag_cli.config import settings
+from local_rag_cli.embed_cache import CachedEmbedding
 from local_rag_cli.storage import (
+    check_qdrant_collections,
     ensure_collections_exist,
     get_image_vector_store,
     get_text_vector_store,
+    persist_vector_store,
 )
 
 console = Console()
 
+# Text chunking: ~12% overlap keeps context across boundaries without
+# re-embedding a fifth of every chunk
+CHUNK_SIZE = 1024
+CHUNK_OVERLAP = 128
+
+# Docstore namespaces, one per ingestion pipeline
+TEXT_DOCSTORE_NAMESPACE = "text_docstore"
+IMAGE_DOCSTORE_NAMESPACE = "image_docstore"
+
+# Hash given to images migrated from a pre-split docstore. Those were embedded
+# from their metadata text rather than their pixels, so the mismatch makes the
+# next run re-embed each one
+LEGACY_IMAGE_HASH = "pre-pixel-embedding"
+
 
 def get_embedding_models():
     """Get embedding models for text and images."""
-    text_embedding = HuggingFaceEmbedding(
-        model_name=settings.TEXT_EMBEDDING_MODEL,
-    )
-    image_embedding = OpenCLIPEmbedding(
-        model_name=settings.IMAGE_EMBEDDING_MODEL,
-        pretrained=settings.IMAGE_EMBEDDING_PRETRAINED,
-    )
-    return text_embedding, image_embedding
+    # Deferred so docstore handling can be used without loading torch
+    from local_rag_cli.models import get_image_embed, get_text_embed
 
+    return get_text_embed(), get_image_embed()
 
-def get_docstore() -> SimpleDocumentStore:
-    """Load existing docstore from disk or create a new one."""
+
+def get_docstores() -> Tuple[SimpleDocumentStore, SimpleDocumentStore]:
+    """Load the text and image docstores from disk or create new ones.
+
+    Both share one key-value store (and file) under separate namespaces, so
+    each pipeline's UPSERTS_AND_DELETE pass only prunes its own documents.
+    """
     persist_dir = settings.DOCSTORE_PATH
     persist_path = Path(persist_dir)
+    docstore_file = persist_path / "docstore.json"
 
-    if persist_path.exists() and (persist_path / "docstore.json").exists():
+    if docstore_file.exists():
         console.print("[dim]Loading existing docstore...[/dim]")
-        return SimpleDocumentStore.from_persist_dir(persist_dir=persist_dir)
+        kvstore = SimpleKVStore.from_persist_path(str(docstore_file))
+    else:
+        console.print("[dim]Creating new docstore...[/dim]")
+        persist_path.mkdir(parents=True, exist_ok=True)
+        kvstore = SimpleKVStore()
+
+    text_docstore = SimpleDocumentStore(kvstore, namespace=TEXT_DOCSTORE_NAMESPACE)
+    image_docstore = SimpleDocumentStore(kvstore, namespace=IMAGE_DOCSTORE_NAMESPACE)
+
+    # Docstores written before the split hold both modalities in the default
+    # namespace; seed both from it and let each pipeline prune the other's docs
+    legacy_docstore = SimpleDocumentStore(kvstore)
+    legacy_docs = legacy_docstore.docs
+    if legacy_docs:
+        for docstore in (text_docstore, image_docstore):
+            docstore.add_documents(list(legacy_docs.values()))
+        image_docstore.set_document_hashes(
+            {doc_id: LEGACY_IMAGE_HASH for doc_id in legacy_docs}
+        )
+        for doc_id in legacy_docs:
+            legacy_docstore.delete_document(doc_id, raise_error=False)
 
-    console.print("[dim]Creating new docstore...[/dim]")
-    persist_path.mkdir(parents=True, exist_ok=True)
-    return SimpleDocumentStore()
+    return text_docstore, image_docstore
 
 
 def persist_docstore(docstore: SimpleDocumentStore) -> None:
-    """Persist the docstore to disk."""
+    """Persist the docstore (and any sharing its key-value store) to disk."""
     persist_dir = settings.DOCSTORE_PATH
     Path(persist_dir).mkdir(parents=True, exist_ok=True)
     docstore.persist(persist_path=str(Path(persist_dir) / "docstore.json"))
 
 
-def ingest_directory(path: Path) -> None:
-    """Ingest all files from a directory."""
-    if not path.exists():
-        console.print(f"[red]Path does not exist: {path}[/red]")
-        return
-
-    if not path.is_dir():
-        console.print(f"[red]Path is not a directory: {path}[/red]")
-        return
-
-    # Ensure collections exist
-    ensure_collections_exist()
-
-    # Load docstore for dedup/update detection
-    docstore = get_docstore()
-
-    # Get embedding models
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Loading embedding models...", total=None)
-        text_embedding, image_embedding = get_embedding_models()
-        progress.update(task, completed=True)
-
-        # Load documents
-        task = progress.add_task(f"Loading documents from {path}...", total=None)
-        reader = SimpleDirectoryReader(
-            input_dir=path,
-            filename_as_id=True,
-            recursive=True,
-        )
-        documents = reader.load_data()
-        progress.update(task, completed=True)
+def load_directory(path: Path) -> List[Document]:
+    """Load all documents from a directory tree."""
+    reader = SimpleDirectoryReader(
+        input_dir=path,
+        filename_as_id=True,
+        recursive=True,
+    )
+    return reader.load_data()
+
+
+def ingest_text_documents(
+    documents: List[Document], docstore: SimpleDocumentStore, embed_model
+) -> int:
+    """Chunk, embed and index text documents, returning the number of chunks."""
+    text_store = get_text_vector_store()
+    pipeline = IngestionPipeline(
+        transformations=[
+            SentenceSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP),
+            CachedEmbedding(
+                embed_model=embed_model,
+                cache_path=settings.EMBED_CACHE_PATH,
+            ),
+        ],
+        vector_store=text_store,
+        docstore=docstore,
+        docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
+    )
+    nodes = pipeline.run(documents=documents)
+    persist_vector_store(text_store, "rag_text")
+    return len(nodes)
+
+
+def ingest_image_documents(
+    documents: List[Document], docstore: SimpleDocumentStore, embed_model
+) -> int:
+    """Embed and index image documents, returning the number of images."""
+    image_store = get_image_vector_store()
+    pipeline = IngestionPipeline(
+        transformations=[
+            embed_model,
+        ],
+        vector_store=image_store,
+        docstore=docstore,
+        docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
+    )
+    nodes = pipeline.run(documents=documents)
+    persist_vector_store(image_store, "rag_images")
+    return len(nodes)
 
-        if not documents:
-            console.print("[yellow]No documents found in directory.[/yellow]")
-            return
 
-        console.print(f"[green]Loaded {len(documents)} documents[/green]")
-
-        # Separate text and image documents
-        text_docs = []
-        image_docs = []
-        for doc in documents:
-            if doc.metadata.get("file_type", "").startswith("image/"):
-                image_docs.append(doc)
-            else:
-                text_docs.append(doc)
-
-        console.print(f"[blue]Text documents: {len(text_docs)}[/blue]")
-        console.print(f"[blue]Image documents: {len(image_docs)}[/blue]")
-
-        # Ingest text documents
-        if text_docs:
-            task = progress.add_task("Processing text documents...", total=None)
-            text_store = get_text_vector_store()
-
-            pipeline = IngestionPipeline(
-                transformations=[
-                    SentenceSplitter(chunk_size=1024, chunk_overlap=200),
-                    text_embedding,
-                ],
-                vector_store=text_store,
-                docstore=docstore,
-                docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
-            )
-            nodes = pipeline.run(documents=text_docs)
-            progress.update(task, completed=True)
-            console.print(f"[green]Indexed {len(nodes)} text chunks[/green]")
-
-        # Ingest image documents
-        if image_docs:
-            task = progress.add_task("Processing image documents...", total=None)
-            image_store = get_image_vector_store()
-
-            pipeline = IngestionPipeline(
-                transformations=[
-                    image_embedding,
-                ],
-                vector_store=image_store,
-                docstore=docstore,
-                docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
-            )
-            nodes = pipeline.run(documents=image_docs)
-            progress.update(task, completed=True)
-            console.print(f"[green]Indexed {len(nodes)} images[/green]")
-
-    # Persist docstore after ingestion
-    persist_docstore(docstore)
-    console.print("[bold green]Ingestion complete![/bold green]")
+def ingest_directory(path: Path) -> None:
+    """Ingest all files from a directory."""
+    ingest_directories([path])
 
 
 def ingest_directories(paths: list[Path]) -> None:
@@ -154,8 +151,8 @@ def ingest_directories(paths: list[Path]) -> None:
     # Ensure collections exist
     ensure_collections_exist()
 
-    # Load docstore for dedup/update detection
-    docstore = get_docstore()
+    # Load docstores for dedup/update detection
+    text_docstore, image_docstore = get_docstores()
 
     # Validate all paths first
     valid_paths = []
@@ -185,18 +182,19 @@ def ingest_directories(paths: list[Path]) -> None:
         all_text_docs = []
         all_image_docs = []
 
-        # Load documents from all directories
-        for path in valid_paths:
-            task = progress.add_task(f"Loading documents from {path}...", total=None)
-            reader = SimpleDirectoryReader(
-                input_dir=path,
-                filename_as_id=True,
-                recursive=True,
-            )
-            documents = reader.load_data()
-            progress.update(task, completed=True)
-
-            # Separate text and image documents
+        # Load documents from all directories concurrently
+        tasks = {
+            path: progress.add_task(f"Loading documents from {path}...", total=None)
+            for path in valid_paths
+        }
+        with ThreadPoolExecutor(max_workers=min(8, len(valid_paths))) as pool:
+            futures = {pool.submit(load_directory, path): path for path in valid_paths}
+            for future in as_completed(futures):
+                progress.update(tasks[futures[future]], completed=True)
+
+        # Separate text and image documents, keeping the input directory order
+        for future in futures:
+            documents = future.result()
             for doc in documents:
                 if doc.metadata.get("file_type", "").startswith("image/"):
                     all_image_docs.append(doc)
@@ -212,42 +210,35 @@ def ingest_directories(paths: list[Path]) -> None:
         console.print(f"[blue]Text documents: {len(all_text_docs)}[/blue]")
         console.print(f"[blue]Image documents: {len(all_image_docs)}[/blue]")
 
-        # Ingest text documents
-        if all_text_docs:
-            task = progress.add_task("Processing text documents...", total=None)
-            text_store = get_text_vector_store()
-
-            pipeline = IngestionPipeline(
-                transformations=[
-                    SentenceSplitter(chunk_size=1024, chunk_overlap=200),
-                    text_embedding,
-                ],
-                vector_store=text_store,
-                docstore=docstore,
-                docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
-            )
-            nodes = pipeline.run(documents=all_text_docs)
-            progress.update(task, completed=True)
-            console.print(f"[green]Indexed {len(nodes)} text chunks[/green]")
-
-        # Ingest image documents
-        if all_image_docs:
-            task = progress.add_task("Processing image documents...", total=None)
-            image_store = get_image_vector_store()
-
-            pipeline = IngestionPipeline(
-                transformations=[
-                    image_embedding,
-                ],
-                vector_store=image_store,
-                docstore=docstore,
-                docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
-            )
-            nodes = pipeline.run(documents=all_image_docs)
-            progress.update(task, completed=True)
-            console.print(f"[green]Indexed {len(nodes)} images[/green]")
-
-    # Persist docstore after ingestion
-    persist_docstore(docstore)
+        # Text and image pipelines touch separate stores and docstore
+        # namespaces, so run them side by side. Forward passes are serialized
+        # on the accelerator lock; image decoding, cache lookups and store
+        # writes overlap with the other pipeline's embedding compute
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = {}
+            if all_text_docs:
+                task = progress.add_task("Processing text documents...", total=None)
+                future = pool.submit(
+                    ingest_text_documents, all_text_docs, text_docstore, text_embedding
+                )
+                futures[future] = (task, "text chunks")
+            if all_image_docs:
+                task = progress.add_task("Processing image documents...", total=None)
+                future = pool.submit(
+                    ingest_image_documents, all_image_docs, image_docstore, image_embedding
+                )
+                futures[future] = (task, "images")
+
+            for future in as_completed(futures):
+                task, unit = futures[future]
+                count = future.result()
+                progress.update(task, completed=True)
+                console.print(f"[green]Indexed {count} {unit}[/green]")
+
+        # Don't record documents as ingested if the server failed to apply them
+        check_qdrant_collections()
+
+    # Persist docstores after ingestion (they share one file)
+    persist_docstore(text_docstore)
     console.print("[bold green]All directories ingested successfully![/bold green]")
 
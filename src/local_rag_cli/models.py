@@ -0,0 +1,38 @@
+"""Shared embedding model instances.
+
+Each model holds its weights on the accelerator, so ingest and query reuse a
+single instance per process instead of loading their own copies.
+"""
+
+from functools import lru_cache
+
+from local_rag_cli.config import settings
+from local_rag_cli.embeddings import CachedHuggingFaceEmbedding, OpenCLIPEmbedding
+
+
+@lru_cache(maxsize=1)
+def get_text_embed() -> CachedHuggingFaceEmbedding:
+    """Get the shared text embedding model."""
+    # Device is left to HuggingFaceEmbedding, which picks MPS/CUDA when available
+    return CachedHuggingFaceEmbedding(
+        model_name=settings.TEXT_EMBEDDING_MODEL,
+        embed_batch_size=settings.EMBED_BATCH_SIZE,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_image_embed() -> OpenCLIPEmbedding:
+    """Get the shared image embedding model."""
+    return OpenCLIPEmbedding(
+        model_name=settings.IMAGE_EMBEDDING_MODEL,
+        pretrained=settings.IMAGE_EMBEDDING_PRETRAINED,
+        compile_model=settings.COMPILE_MODELS,
+        fp16=settings.CLIP_FP16,
+        embed_batch_size=settings.EMBED_BATCH_SIZE,
+    )
+
+
+def preload() -> None:
+    """Load both embedding models up front."""
+    get_text_embed()
+    get_image_embed()
@@ -1,17 +1,17 @@
 """RAG query engine module."""
 
+from functools import lru_cache
 from typing import List, Dict, Any
 
 from llama_index.core.llms import ChatMessage
 from llama_index.core.base.response.schema import Response
-from llama_index.llms.ollama import Ollama
+from llama_index.core.schema import NodeWithScore
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
 
 from local_rag_cli.config import settings
-from local_rag_cli.storage import get_multimodal_index
 
 console = Console()
 
@@ -19,8 +19,11 @@ console = Console()
 EXCERPT_MAX_CHARS = 200
 
 
+@lru_cache(maxsize=1)
 def get_llm():
     """Get LLM instance configured for local inference."""
+    from llama_index.llms.ollama import Ollama
+
     return Ollama(
         model=settings.LLM_MODEL,
         base_url=settings.LLM_BASE_URL,
@@ -34,6 +37,9 @@ def query_index(question: str) -> Response:
     Returns the full LlamaIndex Response object, which includes
     source_nodes with metadata and relevance scores.
     """
+    # Deferred so source formatting doesn't load the embedding models
+    from local_rag_cli.storage import get_multimodal_index
+
     try:
         # Get the multimodal index
         index = get_multimodal_index()
@@ -56,35 +62,43 @@ def query_index(question: str) -> Response:
         raise
 
 
+def _score_key(node_with_score: NodeWithScore) -> float:
+    """Sort key for a node's score, ranking unscored nodes last."""
+    score = node_with_score.score
+    return score if score is not None else float("-inf")
+
+
 def format_sources(response: Response) -> List[Dict[str, Any]]:
     """Extract and format source references from a response.
 
-    Returns a list of dicts with keys: file_name, score, excerpt.
+    Returns a list of dicts with keys: file_name, file_path, score, excerpt,
+    with one entry per file ordered by descending score.
     """
-    sources = []
-    seen_files = set()
-
+    # Deduplicate by file name, keeping the best-scoring node
+    best: Dict[str, NodeWithScore] = {}
     for node_with_score in response.source_nodes:
         metadata = node_with_score.node.metadata
         file_name = metadata.get("file_name", metadata.get("file_path", "Unknown"))
-        file_path = metadata.get("file_path", "")
-        score = node_with_score.score
+        current = best.get(file_name)
+        if current is None or _score_key(node_with_score) > _score_key(current):
+            best[file_name] = node_with_score
 
-        # Get text excerpt
+    ranked = sorted(best.items(), key=lambda item: _score_key(item[1]), reverse=True)
+
+    sources = []
+    for file_name, node_with_score in ranked:
+        # Get text excerpt (only for nodes that are kept)
         text = node_with_score.node.get_content()
         excerpt = text[:EXCERPT_MAX_CHARS].strip()
         if len(text) > EXCERPT_MAX_CHARS:
             excerpt += "..."
 
-        # Deduplicate by file name but keep best score
-        if file_name not in seen_files:
-            seen_files.add(file_name)
-            sources.append({
-                "file_name": file_name,
-                "file_path": file_path,
-                "score": score,
-                "excerpt": excerpt,
-            })
+        sources.append({
+            "file_name": file_name,
+            "file_path": node_with_score.node.metadata.get("file_path", ""),
+            "score": node_with_score.score,
+            "excerpt": excerpt,
+        })
 
     return sources
 
@@ -1,32 +1,118 @@
-"""Storage module for vector store management."""
+"""Storage module for vector store management.
+
+Clients, stores and the index are memoized: settings are fixed for the
+life of the process, and rebuilding the index re-resolves both stores.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
 
 from llama_index.core.indices import MultiModalVectorStoreIndex
 from llama_index.core.storage import StorageContext
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.vector_stores.chroma import ChromaVectorStore
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import (
+    CollectionStatus,
+    Distance,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    PointStruct,
+    VectorParams,
+)
 
 import chromadb
 
 from local_rag_cli.config import settings
-from local_rag_cli.embeddings import OpenCLIPEmbedding
+from local_rag_cli.embed_scan import ScanVectorStore
+
+# Points per Qdrant upsert request during ingest
+QDRANT_UPSERT_BATCH_SIZE = 512
+
+
+class PipelinedQdrantClient(QdrantClient):
+    """QdrantClient whose bulk uploads only wait on their final batch.
+
+    Earlier batches return as soon as the server accepts them, so embedding
+    and sending continue while the server applies them. Qdrant applies a
+    collection's updates in order, so the last batch being applied (wait=True)
+    means every batch before it is too: upload_points still returns only once
+    all of its points are searchable.
+    """
+
+    def upload_points(
+        self,
+        collection_name: str,
+        points: Iterable[PointStruct],
+        batch_size: int = 64,
+        wait: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        points = list(points)
+        head, tail = points[:-batch_size], points[-batch_size:]
+        if head:
+            super().upload_points(
+                collection_name, head, batch_size=batch_size, wait=False, **kwargs
+            )
+        super().upload_points(
+            collection_name, tail, batch_size=batch_size, wait=True, **kwargs
+        )
+
+
+class ImageChromaVectorStore(ChromaVectorStore):
+    """ChromaVectorStore that can delete images by their document id.
+
+    Images are embedded whole, so each is stored as its own document node with
+    no ref doc id in its metadata. ChromaVectorStore.delete only matches that
+    metadata, and Chroma's add skips ids it already holds, so a changed image
+    would keep its old vector. Its node id is its document id, so delete by id too.
+    """
 
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        super().delete(ref_doc_id, **delete_kwargs)
+        self._collection.delete(ids=[ref_doc_id])
 
+
+@lru_cache(maxsize=1)
 def get_qdrant_client() -> QdrantClient:
     """Get Qdrant client instance."""
-    return QdrantClient(
+    return PipelinedQdrantClient(
         url=settings.QDRANT_URL,
         api_key=settings.QDRANT_API_KEY,
+        prefer_grpc=settings.QDRANT_PREFER_GRPC,
+        grpc_port=settings.QDRANT_GRPC_PORT,
     )
 
 
+@lru_cache(maxsize=1)
 def get_chroma_client() -> chromadb.PersistentClient:
     """Get ChromaDB persistent client instance."""
     return chromadb.PersistentClient(path=settings.CHROMADB_PATH)
 
 
+def _memory_store_path(collection_name: str) -> Path:
+    return Path(settings.MEMORY_STORE_PATH) / collection_name
+
+
+def get_memory_vector_store(collection_name: str) -> ScanVectorStore:
+    """Load an in-memory vector store from disk, or create an empty one."""
+    persist_dir = _memory_store_path(collection_name)
+    if ScanVectorStore.exists(persist_dir):
+        return ScanVectorStore.from_persist_dir(persist_dir)
+    return ScanVectorStore()
+
+
+def persist_vector_store(vector_store, collection_name: str) -> None:
+    """Persist a vector store to disk if it is held in memory.
+
+    ChromaDB and Qdrant write through on every add, so this is a no-op for them.
+    """
+    if isinstance(vector_store, ScanVectorStore):
+        vector_store.persist(str(_memory_store_path(collection_name)))
+
+
+@lru_cache(maxsize=1)
 def get_text_vector_store():
     """Get vector store for text documents."""
     if settings.VECTOR_STORE_TYPE == "chromadb":
@@ -40,17 +126,21 @@ def get_text_vector_store():
         return QdrantVectorStore(
             client=client,
             collection_name="rag_text",
+            batch_size=QDRANT_UPSERT_BATCH_SIZE,
         )
+    elif settings.VECTOR_STORE_TYPE == "memory":
+        return get_memory_vector_store("rag_text")
     else:
         raise ValueError(f"Unknown vector store type: {settings.VECTOR_STORE_TYPE}")
 
 
+@lru_cache(maxsize=1)
 def get_image_vector_store():
     """Get vector store for images."""
     if settings.VECTOR_STORE_TYPE == "chromadb":
         client = get_chroma_client()
         collection = client.get_or_create_collection("rag_images")
-        return ChromaVectorStore(
+        return ImageChromaVectorStore(
             chroma_collection=collection,
         )
     elif settings.VECTOR_STORE_TYPE == "qdrant":
@@ -58,25 +148,23 @@ def get_image_vector_store():
         return QdrantVectorStore(
             client=client,
             collection_name="rag_images",
+            batch_size=QDRANT_UPSERT_BATCH_SIZE,
         )
+    elif settings.VECTOR_STORE_TYPE == "memory":
+        return get_memory_vector_store("rag_images")
     else:
         raise ValueError(f"Unknown vector store type: {settings.VECTOR_STORE_TYPE}")
 
 
+@lru_cache(maxsize=1)
 def get_multimodal_index() -> MultiModalVectorStoreIndex:
     """Get multimodal index combining text and image stores."""
+    # Deferred so ingest bookkeeping can use the stores without loading torch
+    from local_rag_cli.models import get_image_embed, get_text_embed
+
     text_store = get_text_vector_store()
     image_store = get_image_vector_store()
 
-    image_embed = OpenCLIPEmbedding(
-        model_name=settings.IMAGE_EMBEDDING_MODEL,
-        pretrained=settings.IMAGE_EMBEDDING_PRETRAINED,
-    )
-
-    text_embed = HuggingFaceEmbedding(
-        model_name=settings.TEXT_EMBEDDING_MODEL,
-    )
-
     storage_context = StorageContext.from_defaults(
         vector_store=text_store,
         image_store=image_store,
@@ -85,11 +173,12 @@ def get_multimodal_index() -> MultiModalVectorStoreIndex:
     return MultiModalVectorStoreIndex(
         nodes=[],
         storage_context=storage_context,
-        image_embed_model=image_embed,
-        embed_model=text_embed,
+        image_embed_model=get_image_embed(),
+        embed_model=get_text_embed(),
     )
 
 
+@lru_cache(maxsize=1)
 def ensure_collections_exist() -> None:
     """Ensure vector store collections exist."""
     if settings.VECTOR_STORE_TYPE == "chromadb":
@@ -107,7 +196,13 @@ def ensure_collections_exist() -> None:
         except Exception:
             client.create_collection(
                 collection_name="rag_text",
-                vectors_config=VectorParams(size=1024, distance=Distance.COSINE),
+                vectors_config=VectorParams(
+                    size=1024,
+                    distance=Distance.COSINE,
+                    on_disk=settings.QDRANT_ON_DISK,
+                ),
+                hnsw_config=HnswConfigDiff(on_disk=settings.QDRANT_ON_DISK),
+                optimizers_config=OptimizersConfigDiff(default_segment_number=2),
             )
 
         # Create image collection if it doesn't exist
@@ -116,5 +211,30 @@ def ensure_collections_exist() -> None:
         except Exception:
             client.create_collection(
                 collection_name="rag_images",
-                vectors_config=VectorParams(size=512, distance=Distance.COSINE),
+                vectors_config=VectorParams(
+                    size=512,
+                    distance=Distance.COSINE,
+                    on_disk=settings.QDRANT_ON_DISK,
+                ),
+                hnsw_config=HnswConfigDiff(on_disk=settings.QDRANT_ON_DISK),
+                optimizers_config=OptimizersConfigDiff(default_segment_number=2),
+            )
+
+
+def check_qdrant_collections(
+    collection_names: tuple[str, ...] = ("rag_text", "rag_images"),
+) -> None:
+    """Raise if Qdrant reports an error state (RED) for any of the collections.
+
+    A no-op for the other store types.
+    """
+    if settings.VECTOR_STORE_TYPE != "qdrant":
+        return
+
+    client = get_qdrant_client()
+    for name in collection_names:
+        info = client.get_collection(name)
+        if info.status == CollectionStatus.RED:
+            raise RuntimeError(
+                f"Qdrant collection {name} is in an error state: {info.optimizer_status}"
             )
@@ -1,69 +1,143 @@
 """Tests for configuration module."""
 
 import os
-from unittest.mock import patch
+import subprocess
+import sys
+from dataclasses import FrozenInstanceError, asdict
+from pathlib import Path
 
 import pytest
 
-from local_rag_cli.config import Settings
+import local_rag_cli
+from local_rag_cli.config import Settings, get_settings
+
+EXPECTED_DEFAULTS = {
+    "VECTOR_STORE_TYPE": "chromadb",
+    "CHROMADB_PATH": "./chromadb_data",
+    "MEMORY_STORE_PATH": "./memory_store_data",
+    "DOCSTORE_PATH": "./docstore_data",
+    "EMBED_CACHE_PATH": "./embed_cache_data",
+    "QDRANT_URL": "http://localhost:6333",
+    "QDRANT_PREFER_GRPC": True,
+    "QDRANT_GRPC_PORT": 6334,
+    "QDRANT_ON_DISK": False,
+    "LLM_BASE_URL": "http://localhost:1234/v1",
+    "LLM_MODEL": "local-model",
+    "TEXT_EMBEDDING_MODEL": "BAAI/bge-m3",
+    "IMAGE_EMBEDDING_MODEL": "ViT-B-32",
+    "IMAGE_EMBEDDING_PRETRAINED": "laion2b_s34b_b79k",
+    "EMBED_BATCH_SIZE": 64,
+    "COMPILE_MODELS": False,
+    "CLIP_FP16": True,
+    "REQUEST_TIMEOUT": 600.0,
+    "LOG_LEVEL": "INFO",
+}
+
+
+@pytest.fixture(scope="session")
+def default_settings():
+    """Settings with every field at its default, shared by read-only tests."""
+    return Settings()
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_cache(tmp_path, monkeypatch):
+    """Rebuild settings from the (patched) environment in each test.
+
+    Runs each test from an empty directory so get_settings() never loads the
+    developer's .env into the environment.
+    """
+    monkeypatch.chdir(tmp_path)
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
 
 
 class TestSettings:
     """Test suite for Settings configuration."""
 
-    def test_default_values(self):
+    def test_default_values(self, default_settings, monkeypatch):
         """Test that default values are set correctly."""
-        settings = Settings()
-
-        assert settings.VECTOR_STORE_TYPE == "chromadb"
-        assert settings.CHROMADB_PATH == "./chromadb_data"
-        assert settings.QDRANT_URL == "http://localhost:6333"
-        assert settings.QDRANT_API_KEY is None
-        assert settings.LLM_BASE_URL == "http://localhost:1234/v1"
-        assert settings.LLM_API_KEY is None
-        assert settings.LLM_MODEL == "local-model"
-        assert settings.TEXT_EMBEDDING_MODEL == "BAAI/bge-m3"
-        assert settings.IMAGE_EMBEDDING_MODEL == "ViT-B/32"
-        assert settings.REQUEST_TIMEOUT == 600.0
-        assert settings.LOG_LEVEL == "INFO"
-
-    def test_env_var_override(self):
-        """Test that environment variables override defaults."""
-        with patch.dict(
-            os.environ,
-            {
-                "VECTOR_STORE_TYPE": "qdrant",
-                "CHROMADB_PATH": "/custom/chroma/path",
-                "QDRANT_URL": "http://qdrant.example.com:6333",
-                "LLM_MODEL": "custom-model",
-                "REQUEST_TIMEOUT": "300.0",
-            },
-        ):
-            settings = Settings()
-
-            assert settings.VECTOR_STORE_TYPE == "qdrant"
-            assert settings.CHROMADB_PATH == "/custom/chroma/path"
-            assert settings.QDRANT_URL == "http://qdrant.example.com:6333"
-            assert settings.LLM_MODEL == "custom-model"
-            assert settings.REQUEST_TIMEOUT == 300.0
-
-    def test_api_key_from_env(self):
-        """Test that API keys can be loaded from environment."""
-        with patch.dict(
-            os.environ,
-            {
-                "QDRANT_API_KEY": "secret-qdrant-key",
-                "LLM_API_KEY": "secret-llm-key",
-            },
-        ):
-            settings = Settings()
-
-            assert settings.QDRANT_API_KEY == "secret-qdrant-key"
-            assert settings.LLM_API_KEY == "secret-llm-key"
-
-    def test_request_timeout_type(self):
-        """Test that REQUEST_TIMEOUT is parsed as float."""
-        with patch.dict(os.environ, {"REQUEST_TIMEOUT": "120"}):
-            settings = Settings()
-            assert isinstance(settings.REQUEST_TIMEOUT, float)
-            assert settings.REQUEST_TIMEOUT == 120.0
+        monkeypatch.delenv("QDRANT_API_KEY", raising=False)
+        monkeypatch.delenv("LLM_API_KEY", raising=False)
+
+        assert asdict(default_settings) == EXPECTED_DEFAULTS
+        assert default_settings.QDRANT_API_KEY is None
+        assert default_settings.LLM_API_KEY is None
+
+    def test_settings_are_frozen(self, default_settings):
+        """Test that the shared settings instance cannot be mutated."""
+        with pytest.raises(FrozenInstanceError):
+            default_settings.LOG_LEVEL = "DEBUG"
+
+    @pytest.mark.parametrize(
+        "env_key,env_val,expected",
+        [
+            ("VECTOR_STORE_TYPE", "qdrant", "qdrant"),
+            ("CHROMADB_PATH", "/custom/chroma/path", "/custom/chroma/path"),
+            ("QDRANT_URL", "http://qdrant:6333", "http://qdrant:6333"),
+            ("LLM_MODEL", "custom-model", "custom-model"),
+            ("REQUEST_TIMEOUT", "300.0", 300.0),
+            ("REQUEST_TIMEOUT", "120", 120.0),
+            ("QDRANT_API_KEY", "secret-qdrant-key", "secret-qdrant-key"),
+            ("LLM_API_KEY", "secret-llm-key", "secret-llm-key"),
+            ("EMBED_BATCH_SIZE", "16", 16),
+            ("QDRANT_PREFER_GRPC", "false", False),
+            ("COMPILE_MODELS", "On", True),
+        ],
+    )
+    def test_env_var_override(self, monkeypatch, env_key, env_val, expected):
+        """Test that environment variables override defaults, parsed to the field type."""
+        monkeypatch.setenv(env_key, env_val)
+
+        value = getattr(get_settings(), env_key)
+
+        assert value == expected
+        assert type(value) is type(expected)
+
+    @pytest.mark.parametrize(
+        "env_key,env_val",
+        [
+            ("REQUEST_TIMEOUT", "ten minutes"),
+            ("EMBED_BATCH_SIZE", "64.5"),
+            ("CLIP_FP16", "ture"),
+            ("QDRANT_ON_DISK", "2"),
+        ],
+    )
+    def test_invalid_value_names_field(self, monkeypatch, env_key, env_val):
+        """Test that unparseable values report which setting is wrong."""
+        monkeypatch.setenv(env_key, env_val)
+
+        with pytest.raises(ValueError, match=env_key):
+            get_settings()
+
+    def test_load_env_file(self, tmp_path, monkeypatch):
+        """Test that .env values apply only when requested and never beat the environment."""
+        env_file = tmp_path / ".env"
+        env_file.write_text("LLM_MODEL=file-model\nQDRANT_URL=http://file:6333\n")
+        # Set before deleting so teardown also removes what load() writes
+        monkeypatch.setenv("LLM_MODEL", "unset")
+        monkeypatch.delenv("LLM_MODEL")
+        monkeypatch.setenv("QDRANT_URL", "http://env:6333")
+
+        assert Settings.from_env().LLM_MODEL == "local-model"
+
+        settings = Settings.load(str(env_file))
+        assert settings.LLM_MODEL == "file-model"
+        assert settings.QDRANT_URL == "http://env:6333"
+
+    def test_import_is_lightweight(self):
+        """Test that importing the config module pulls in no heavy dependencies."""
+        code = (
+            "import sys, local_rag_cli.config; "
+            "print(*sorted({'dotenv', 'pydantic', 'unittest.mock'} & set(sys.modules)))"
+        )
+        src_dir = str(Path(local_rag_cli.__file__).parents[1])
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONPATH": src_dir},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == ""
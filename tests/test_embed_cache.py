@@ -0,0 +1,47 @@
+"""Tests for the persistent embedding cache."""
+
+from typing import List
+
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import TextNode
+
+from local_rag_cli.embed_cache import CachedEmbedding, EmbeddingCache, content_hash
+
+
+class CountingEmbedding(MockEmbedding):
+    """Mock embedding model that records every text it embeds."""
+
+    calls: List[str] = []
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        self.calls.extend(texts)
+        return super()._get_text_embeddings(texts)
+
+
+class TestEmbeddingCache:
+    """Test suite for EmbeddingCache and CachedEmbedding."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that stored vectors are returned for matching keys only."""
+        with EmbeddingCache(tmp_path / "cache.db") as cache:
+            cache.put_many([("abc", [0.5, -0.25])], model="m", pretrained="p")
+
+            assert cache.get_many(["abc", "missing"], "m", "p") == {"abc": [0.5, -0.25]}
+            assert cache.get_many(["abc"], "other-model", "p") == {}
+
+    def test_content_hash_is_stable(self):
+        """Test that identical text always maps to the same key."""
+        assert content_hash("hello") == content_hash("hello")
+        assert content_hash("hello") != content_hash("world")
+
+    def test_only_misses_are_embedded(self, tmp_path):
+        """Test that a second run reuses cached embeddings."""
+        embed_model = CountingEmbedding(embed_dim=4, calls=[])
+        transform = CachedEmbedding(embed_model=embed_model, cache_path=str(tmp_path))
+
+        transform([TextNode(text="first"), TextNode(text="second")])
+        assert len(embed_model.calls) == 2
+
+        nodes = transform([TextNode(text="first"), TextNode(text="third")])
+        assert len(embed_model.calls) == 3
+        assert all(node.embedding is not None for node in nodes)
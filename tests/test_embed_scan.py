@@ -0,0 +1,130 @@
+"""Tests for the in-memory scan vector store."""
+
+import numpy as np
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+from llama_index.core.vector_stores.types import (
+    ExactMatchFilter,
+    MetadataFilters,
+    VectorStoreQuery,
+)
+
+from local_rag_cli.embed_scan import EMBEDDINGS_FILE_NAME, EmbedScan, ScanVectorStore
+
+
+class TestEmbedScan:
+    """Test suite for EmbedScan and ScanVectorStore."""
+
+    def test_search_orders_by_cosine_similarity(self):
+        """Test that results are ranked best first and capped at k."""
+        scan = EmbedScan()
+        scan.add(["a", "b", "c"], [[1.0, 0.0], [0.0, 1.0], [2.0, 2.0]])
+
+        similarities, ids = scan.search([1.0, 0.1], k=2)
+
+        assert ids == ["a", "c"]
+        assert similarities[0] > similarities[1]
+
+    def test_search_handles_zero_rows_and_large_k(self):
+        """Test that zero vectors score 0 and k beyond the row count returns all rows."""
+        scan = EmbedScan()
+        scan.add(["zero", "x"], [[0.0, 0.0], [3.0, 0.0]])
+
+        similarities, ids = scan.search([2.0, 0.0], k=10)
+
+        assert ids == ["x", "zero"]
+        assert similarities == [1.0, 0.0]
+
+    def test_search_empty(self):
+        """Test that searching an empty scan returns nothing."""
+        assert EmbedScan().search([1.0, 0.0], k=3) == ([], [])
+
+    def test_add_overwrites_and_remove_drops_rows(self):
+        """Test that re-adding an id replaces its row and removal keeps rows aligned."""
+        scan = EmbedScan()
+        scan.add(["a", "b", "c"], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+        scan.add(["a"], [[0.0, -1.0]])
+        scan.remove(["b"])
+
+        assert scan.ids == ["a", "c"]
+        assert scan.search([0.0, -1.0], k=1) == ([1.0], ["a"])
+
+    def test_store_returns_nodes_and_tracks_updates(self):
+        """Test that added nodes are queryable and deletes apply per document."""
+        store = ScanVectorStore()
+        store.add([TextNode(id_="a", text="apples", embedding=[1.0, 0.0])])
+        query = VectorStoreQuery(query_embedding=[1.0, 0.0], similarity_top_k=1)
+        assert store.query(query).ids == ["a"]
+
+        node = TextNode(id_="b", text="bananas", embedding=[0.0, 1.0])
+        node.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(node_id="doc-b")
+        store.add([node])
+        query = VectorStoreQuery(query_embedding=[0.1, 1.0], similarity_top_k=1)
+        result = store.query(query)
+        assert result.ids == ["b"]
+        assert result.nodes[0].get_content() == "bananas"
+
+        store.delete("doc-b")
+        assert store.query(query).ids == ["a"]
+
+    def test_query_filters(self):
+        """Test that metadata filters, node ids and doc ids restrict the candidates."""
+        store = ScanVectorStore()
+        a = TextNode(id_="a", text="a", metadata={"kind": "x"}, embedding=[1.0, 0.0])
+        b = TextNode(id_="b", text="b", metadata={"kind": "y"}, embedding=[0.9, 0.1])
+        b.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(node_id="doc-b")
+        store.add([a, b])
+        filters = MetadataFilters(filters=[ExactMatchFilter(key="kind", value="y")])
+        query = VectorStoreQuery(
+            query_embedding=[1.0, 0.0], similarity_top_k=2, filters=filters
+        )
+        assert store.query(query).ids == ["b"]
+
+        query = VectorStoreQuery(
+            query_embedding=[1.0, 0.0], similarity_top_k=2, node_ids=["b"]
+        )
+        assert store.query(query).ids == ["b"]
+
+        query = VectorStoreQuery(
+            query_embedding=[1.0, 0.0], similarity_top_k=2, doc_ids=["doc-b"]
+        )
+        assert store.query(query).ids == ["b"]
+
+        query = VectorStoreQuery(
+            query_embedding=[1.0, 0.0], similarity_top_k=2, doc_ids=[]
+        )
+        assert store.query(query).ids == []
+
+    def test_persist_round_trip(self, tmp_path):
+        """Test that a store reloads from the matrix and node files it persists."""
+        store = ScanVectorStore()
+        store.add(
+            [
+                TextNode(id_="a", text="apples", embedding=[3.0, 0.0]),
+                TextNode(id_="b", text="bananas", embedding=[0.0, 2.0]),
+            ]
+        )
+        store.persist(str(tmp_path / "rag_text"))
+
+        assert ScanVectorStore.exists(tmp_path / "rag_text")
+        mat = np.load(tmp_path / "rag_text" / EMBEDDINGS_FILE_NAME)
+        assert mat.dtype == np.float32
+        assert mat.shape == (2, 2)
+
+        reloaded = ScanVectorStore.from_persist_dir(tmp_path / "rag_text")
+        query = VectorStoreQuery(query_embedding=[0.1, 1.0], similarity_top_k=2)
+        result = reloaded.query(query)
+        assert result.ids == ["b", "a"]
+        assert result.nodes[0].get_content() == "bananas"
+
+        # Rewriting the files the matrix is mapped from must not corrupt it
+        reloaded.persist(str(tmp_path / "rag_text"))
+        assert reloaded.query(query).ids == ["b", "a"]
+
+        # Updates after loading apply to the mapped matrix and persist again
+        reloaded.add([TextNode(id_="c", text="cherries", embedding=[-1.0, 0.0])])
+        reloaded.delete_nodes(node_ids=["a"])
+        reloaded.persist(str(tmp_path / "rag_text"))
+
+        again = ScanVectorStore.from_persist_dir(tmp_path / "rag_text")
+        query = VectorStoreQuery(query_embedding=[-1.0, 0.0], similarity_top_k=5)
+        assert again.query(query).ids == ["c", "b"]
@@ -0,0 +1,62 @@
+"""Tests for the embedding models' query cache."""
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("torchvision")
+pytest.importorskip("llama_index.embeddings.huggingface")
+
+from local_rag_cli.embeddings import QueryEmbeddingCache  # noqa: E402
+
+
+class TestQueryEmbeddingCache:
+    """Test suite for QueryEmbeddingCache."""
+
+    def test_counts_hits_and_misses(self):
+        """Test that lookups are counted and reported with the hit rate."""
+        cache = QueryEmbeddingCache(maxsize=4)
+        assert cache.get("q") is None
+
+        cache.put("q", [0.5, 0.25])
+        assert cache.get("q") == [0.5, 0.25]
+        assert cache.get("q") == [0.5, 0.25]
+
+        assert cache.stats() == {"hits": 2, "misses": 1, "size": 1, "hit_rate": 2 / 3}
+
+    def test_evicts_least_recently_used(self):
+        """Test that a hit refreshes an entry so the oldest unused one is evicted."""
+        cache = QueryEmbeddingCache(maxsize=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+
+        cache.put("c", [3.0])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+        assert cache.stats()["size"] == 2
+
+    def test_put_existing_key_refreshes_it(self):
+        """Test that overwriting an entry also marks it most recently used."""
+        cache = QueryEmbeddingCache(maxsize=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.put("a", [1.5])
+
+        cache.put("c", [3.0])
+
+        assert cache.get("a") == [1.5]
+        assert cache.get("b") is None
+
+    def test_clear_resets_entries_and_counters(self):
+        """Test that clear() empties the cache and zeroes its statistics."""
+        cache = QueryEmbeddingCache(maxsize=2)
+        cache.put("a", [1.0])
+        cache.get("a")
+        cache.get("missing")
+
+        cache.clear()
+
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "hit_rate": 0.0}
+        assert cache.get("a") is None
@@ -0,0 +1,69 @@
+"""Tests for ingestion docstore handling."""
+
+from llama_index.core import Document
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.ingestion import DocstoreStrategy, IngestionPipeline
+from llama_index.core.storage.docstore import SimpleDocumentStore
+from llama_index.core.storage.kvstore import SimpleKVStore
+
+from local_rag_cli import ingest
+from local_rag_cli.config import Settings
+from local_rag_cli.embed_scan import ScanVectorStore
+
+
+def _run(documents, docstore):
+    pipeline = IngestionPipeline(
+        transformations=[MockEmbedding(embed_dim=2)],
+        vector_store=ScanVectorStore(),
+        docstore=docstore,
+        docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
+    )
+    return pipeline.run(documents=documents)
+
+
+class TestGetDocstores:
+    """Test suite for loading and migrating the ingest docstores."""
+
+    def test_migrates_legacy_docstore(self, tmp_path, monkeypatch):
+        """Test that a pre-split docstore seeds both namespaces and images re-embed."""
+        monkeypatch.setattr(ingest, "settings", Settings(DOCSTORE_PATH=str(tmp_path)))
+        text_doc = Document(id_="notes.txt", text="notes")
+        image_doc = Document(
+            id_="photo.png", text="photo", metadata={"file_type": "image/png"}
+        )
+        legacy_docstore = SimpleDocumentStore()
+        legacy_docstore.add_documents([text_doc, image_doc])
+        legacy_docstore.set_document_hashes(
+            {doc.doc_id: doc.hash for doc in (text_doc, image_doc)}
+        )
+        legacy_docstore.persist(str(tmp_path / "docstore.json"))
+
+        text_docstore, image_docstore = ingest.get_docstores()
+        ingest.persist_docstore(text_docstore)
+
+        expected = {"notes.txt", "photo.png"}
+        assert set(text_docstore.docs) == expected
+        assert set(image_docstore.docs) == expected
+        assert image_docstore.get_document_hash("photo.png") == ingest.LEGACY_IMAGE_HASH
+        kvstore = SimpleKVStore.from_persist_path(str(tmp_path / "docstore.json"))
+        assert SimpleDocumentStore(kvstore).docs == {}
+
+        # Unchanged text is skipped; images are re-embedded once, then skipped
+        assert _run([text_doc], text_docstore) == []
+        assert [node.node_id for node in _run([image_doc], image_docstore)] == [
+            "photo.png"
+        ]
+        assert _run([image_doc], image_docstore) == []
+        assert set(image_docstore.docs) == {"photo.png"}
+
+    def test_creates_empty_docstores(self, tmp_path, monkeypatch):
+        """Test that a missing docstore file yields empty, separate namespaces."""
+        persist_dir = tmp_path / "docstore"
+        monkeypatch.setattr(ingest, "settings", Settings(DOCSTORE_PATH=str(persist_dir)))
+
+        text_docstore, image_docstore = ingest.get_docstores()
+        text_docstore.add_documents([Document(id_="notes.txt", text="notes")])
+
+        assert persist_dir.is_dir()
+        assert set(text_docstore.docs) == {"notes.txt"}
+        assert image_docstore.docs == {}
@@ -0,0 +1,39 @@
+"""Tests for the RAG query module."""
+
+from llama_index.core.base.response.schema import Response
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from local_rag_cli.rag import format_sources
+
+
+def _node(file_name: str, text: str, score):
+    metadata = {"file_name": file_name, "file_path": f"/docs/{file_name}"}
+    return NodeWithScore(node=TextNode(text=text, metadata=metadata), score=score)
+
+
+class TestFormatSources:
+    """Test suite for format_sources."""
+
+    def test_keeps_best_node_per_file_sorted_by_score(self):
+        """Test that each file keeps its best chunk, best file first, unscored last."""
+        response = Response(
+            response="answer",
+            source_nodes=[
+                _node("notes.md", "weak match", 0.2),
+                _node("notes.md", "strong match", 0.9),
+                _node("unscored.md", "no score", None),
+                _node("other.md", "other match", 0.5),
+            ],
+        )
+
+        sources = format_sources(response)
+
+        assert [source["file_name"] for source in sources] == [
+            "notes.md",
+            "other.md",
+            "unscored.md",
+        ]
+        assert sources[0]["score"] == 0.9
+        assert sources[0]["excerpt"] == "strong match"
+        assert sources[0]["file_path"] == "/docs/notes.md"
+        assert sources[2]["score"] is None
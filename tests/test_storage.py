@@ -0,0 +1,118 @@
+"""Tests for vector store management."""
+
+from types import SimpleNamespace
+
+import chromadb
+import pytest
+from llama_index.core import Document
+from llama_index.core.schema import TextNode
+from llama_index.vector_stores.qdrant import QdrantVectorStore
+from qdrant_client.models import CollectionStatus, Distance, VectorParams
+
+from local_rag_cli import storage
+from local_rag_cli.config import Settings
+from local_rag_cli.storage import (
+    QDRANT_UPSERT_BATCH_SIZE,
+    ImageChromaVectorStore,
+    PipelinedQdrantClient,
+    check_qdrant_collections,
+)
+
+
+class _StatusClient:
+    """Stands in for a Qdrant client, reporting a fixed collection status."""
+
+    def __init__(self, status):
+        self.status = status
+        self.checked = []
+
+    def get_collection(self, collection_name):
+        self.checked.append(collection_name)
+        return SimpleNamespace(status=self.status, optimizer_status="error")
+
+
+@pytest.fixture
+def qdrant_client():
+    client = PipelinedQdrantClient(location=":memory:")
+    client.create_collection(
+        "rag_text", vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    return client
+
+
+class TestPipelinedQdrantClient:
+    """Test suite for PipelinedQdrantClient."""
+
+    def test_store_add_applies_every_batch(self, qdrant_client):
+        """Test that points from all batches, not just the last, are searchable."""
+        store = QdrantVectorStore(
+            client=qdrant_client,
+            collection_name="rag_text",
+            batch_size=QDRANT_UPSERT_BATCH_SIZE,
+        )
+        nodes = [
+            TextNode(text=f"chunk {i}", embedding=[1.0, i / 1100]) for i in range(1100)
+        ]
+
+        store.add(nodes)
+
+        assert qdrant_client.count("rag_text").count == 1100
+
+    def test_upload_no_points(self, qdrant_client):
+        """Test that an empty upload is accepted and adds nothing."""
+        qdrant_client.upload_points("rag_text", [])
+
+        assert qdrant_client.count("rag_text").count == 0
+
+
+class TestCheckQdrantCollections:
+    """Test suite for check_qdrant_collections."""
+
+    def test_raises_on_red_collection(self, monkeypatch):
+        """Test that a collection in an error state fails the check."""
+        monkeypatch.setattr(storage, "settings", Settings(VECTOR_STORE_TYPE="qdrant"))
+        client = _StatusClient(CollectionStatus.RED)
+        monkeypatch.setattr(storage, "get_qdrant_client", lambda: client)
+
+        with pytest.raises(RuntimeError, match="rag_text"):
+            check_qdrant_collections()
+
+    def test_passes_healthy_collections(self, monkeypatch):
+        """Test that every collection is checked when none is RED."""
+        monkeypatch.setattr(storage, "settings", Settings(VECTOR_STORE_TYPE="qdrant"))
+        client = _StatusClient(CollectionStatus.YELLOW)
+        monkeypatch.setattr(storage, "get_qdrant_client", lambda: client)
+
+        check_qdrant_collections()
+
+        assert client.checked == ["rag_text", "rag_images"]
+
+    def test_noop_for_other_stores(self, monkeypatch):
+        """Test that no Qdrant client is created for the other store types."""
+        monkeypatch.setattr(storage, "settings", Settings(VECTOR_STORE_TYPE="chromadb"))
+        client = _StatusClient(CollectionStatus.RED)
+        monkeypatch.setattr(storage, "get_qdrant_client", lambda: client)
+
+        check_qdrant_collections()
+
+        assert client.checked == []
+
+
+class TestImageChromaVectorStore:
+    """Test suite for ImageChromaVectorStore."""
+
+    def test_delete_removes_image_by_document_id(self):
+        """Test that deleting an image's document id drops its vector."""
+        collection = chromadb.EphemeralClient().create_collection("test_rag_images")
+        store = ImageChromaVectorStore(chroma_collection=collection)
+        store.add(
+            [
+                Document(id_="a.png", text="a", embedding=[1.0, 0.0]),
+                Document(id_="b.png", text="b", embedding=[0.0, 1.0]),
+            ]
+        )
+
+        store.delete("a.png")
+        store.delete("missing.png")
+
+        assert collection.get()["ids"] == ["b.png"]